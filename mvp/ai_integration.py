@@ -4,16 +4,45 @@ Supports OpenAI DALL-E and Stable Diffusion APIs
 """
 
 import os
-import requests
+import asyncio
 import base64
 import io
+import random
+import threading
+import aiohttp
+import orjson
+import numpy as np
 from PIL import Image
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
 import openai
 from dataclasses import dataclass
+from functools import lru_cache
 import time
 import hashlib
 
+# Optional CLIP embedding model for the approximate prompt cache
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# Optional FAISS for sub-linear similarity search once the cache grows
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Dimensions DALL-E 3 actually accepts (kept in sync with /models capabilities)
+DALLE_SUPPORTED_DIMENSIONS = ("1024x1024", "1792x1024", "1024x1792")
+DALLE_SUPPORTED_QUALITIES = ("standard", "hd")
+
+@lru_cache(maxsize=32)
+def parse_dimensions(dimensions: str) -> Tuple[int, int]:
+    """Parse a 'WxH' string into ints; cached since only a handful of sizes recur"""
+    width, height = map(int, dimensions.split('x'))
+    return width, height
+
 @dataclass
 class AIGenerationRequest:
     prompt: str
@@ -22,6 +51,99 @@ class AIGenerationRequest:
     model_preference: str = "dalle"  # "dalle" or "stable_diffusion"
     quality: str = "standard"  # "standard" or "hd" for DALL-E
 
+class PromptEmbeddingCache:
+    """
+    Approximate cache for generated assets keyed on CLIP embeddings
+    Semantically similar prompts return the cached image instead of a new API call
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, max_entries: int = 512):
+        self.model = SentenceTransformer('sentence-transformers/clip-ViT-B-32')
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        # Maps cache key -> (unit-norm embedding, asset_id, PNG bytes), LRU order
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, str, bytes]]" = OrderedDict()
+        # Optional HNSW index: O(log N) lookups vs the O(N*d) linear scan
+        self._index = None
+        self._index_keys: list = []
+        # lookup/store run on worker threads; neither the OrderedDict nor
+        # FAISS add/search tolerate concurrent mutation
+        self._lock = threading.Lock()
+
+    def _get_index(self, dim: int):
+        """Lazily build the FAISS HNSW index (inner product == cosine on unit vectors)"""
+        if self._index is None:
+            self._index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+            self._index.hnsw.efConstruction = 200
+            self._index.hnsw.efSearch = 64
+        return self._index
+
+    def _embed(self, key_text: str) -> np.ndarray:
+        embedding = self.model.encode(key_text).astype(np.float32)
+        # Normalize so inner product == cosine similarity
+        return embedding / np.linalg.norm(embedding)
+
+    @staticmethod
+    def _key_text(request: AIGenerationRequest) -> str:
+        return f"{request.prompt}|{request.style}|{request.dimensions}"
+
+    def lookup(self, request: AIGenerationRequest) -> Optional[Tuple[str, bytes]]:
+        """Return (asset_id, PNG bytes) for the most similar cached prompt, or None"""
+        if not self._entries:
+            return None
+
+        # Embed outside the lock: model.encode is the expensive part and
+        # touches no shared state
+        embedding = self._embed(self._key_text(request))
+
+        with self._lock:
+            if not self._entries:
+                return None
+
+            if self._index is not None and self._index.ntotal > 0:
+                similarities, rows = self._index.search(embedding[None, :], 1)
+                best_similarity = float(similarities[0][0])
+                key = self._index_keys[int(rows[0][0])]
+            else:
+                keys = list(self._entries.keys())
+                matrix = np.stack([self._entries[k][0] for k in keys])
+                similarities = matrix @ embedding
+                best = int(np.argmax(similarities))
+                best_similarity = float(similarities[best])
+                key = keys[best]
+
+            if best_similarity >= self.similarity_threshold and key in self._entries:
+                self._entries.move_to_end(key)
+                _, asset_id, image_bytes = self._entries[key]
+                return asset_id, image_bytes
+
+        return None
+
+    def store(self, request: AIGenerationRequest, asset_id: str, image: Image.Image,
+              image_bytes: Optional[bytes] = None):
+        """Cache the generated image as PNG bytes, evicting the LRU entry when full"""
+        if image_bytes is None:
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG')
+            image_bytes = buffer.getvalue()
+
+        key = self._key_text(request)
+        embedding = self._embed(key)
+
+        with self._lock:
+            self._entries[key] = (embedding, asset_id, image_bytes)
+            self._entries.move_to_end(key)
+
+            if faiss is not None:
+                # HNSW graphs do not support deletion, so entries are kept;
+                # image payloads are still bounded by the LRU eviction below
+                self._get_index(embedding.shape[0]).add(embedding[None, :])
+                self._index_keys.append(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
 class RealAIAssetGenerator:
     """
     Real AI Asset Generator using actual AI models
@@ -33,13 +155,30 @@ class RealAIAssetGenerator:
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         self.stability_api_key = os.getenv('STABILITY_API_KEY')
         
-        # Initialize OpenAI client
-        if self.openai_api_key:
-            openai.api_key = self.openai_api_key
-        
+        # Initialize async OpenAI client
+        self.openai_client = openai.AsyncOpenAI(api_key=self.openai_api_key) if self.openai_api_key else None
+
+        # Shared aiohttp session (created lazily on the running event loop)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Approximate prompt cache (enabled when sentence-transformers is installed)
+        self.embedding_cache = PromptEmbeddingCache() if SentenceTransformer else None
+
+        # Exact cache: deterministic request hash -> PNG bytes, LRU-bounded
+        # like the embedding cache so a long-running server stays flat
+        self._exact_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._exact_cache_max = 512
+
+        # Procedural fallback generator, imported and constructed on first use
+        self._fallback = None
+
+        # Per-provider concurrency caps so we stay under published rate limits
+        self._dalle_semaphore = asyncio.Semaphore(10)
+        self._sd_semaphore = asyncio.Semaphore(50)
+
         # Stable Diffusion API endpoint
         self.stability_url = "https://api.stability.ai/v1/generation/stable-diffusion-xl-1024-v1-0/text-to-image"
-        
+
         # Style mappings for different AI models
         self.dalle_style_prompts = {
             "realistic": "photorealistic, high quality, detailed",
@@ -47,7 +186,7 @@ class RealAIAssetGenerator:
             "pixel": "pixel art style, 8-bit, retro gaming",
             "minimalist": "minimalist design, clean, simple"
         }
-        
+
         self.sd_style_prompts = {
             "realistic": "photorealistic, ultra detailed, 8k resolution",
             "cartoon": "cartoon illustration, vibrant colors, stylized",
@@ -55,45 +194,219 @@ class RealAIAssetGenerator:
             "minimalist": "minimalist art, clean design, geometric"
         }
 
-    def generate_with_dalle(self, request: AIGenerationRequest) -> Dict[str, Any]:
+        # Precomputed per-style prompt suffixes so assembly is one concatenation
+        self.dalle_templates = {
+            style: f", {enhancement}, game asset"
+            for style, enhancement in self.dalle_style_prompts.items()
+        }
+        self.sd_templates = {
+            style: f", {enhancement}, game asset, high quality"
+            for style, enhancement in self.sd_style_prompts.items()
+        }
+
+        # Provider kwargs precomputed for every supported combination, so each
+        # call is one dict lookup and invalid combinations fail up front
+        # instead of being silently rewritten to 1024x1024
+        self._dalle_kwargs = {
+            (dimensions, quality): {
+                "model": "dall-e-3",
+                "size": dimensions,
+                "quality": quality,
+                "n": 1
+            }
+            for dimensions in DALLE_SUPPORTED_DIMENSIONS
+            for quality in DALLE_SUPPORTED_QUALITIES
+        }
+
+    @staticmethod
+    def _backoff_delay(attempt: int, retry_after: Optional[str]) -> float:
+        """Honor Retry-After when the provider sends one, else back off exponentially"""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = 0.5 * (2 ** attempt)
+        return delay + random.uniform(0, 0.25)
+
+    async def _post_stability(self, data: Dict[str, Any], accept: str,
+                              max_attempts: int = 4) -> bytes:
+        """POST to Stability, retrying 429/5xx with Retry-After-aware backoff"""
+        session = await self._get_session()
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": accept,
+            "Authorization": f"Bearer {self.stability_api_key}"
+        }
+
+        async with self._sd_semaphore:
+            for attempt in range(max_attempts):
+                async with session.post(self.stability_url, headers=headers, json=data) as response:
+                    if response.status == 200:
+                        return await response.read()
+
+                    retryable = response.status == 429 or response.status >= 500
+                    if retryable and attempt + 1 < max_attempts:
+                        retry_after = response.headers.get("Retry-After")
+                    else:
+                        raise Exception(f"Stability AI API error: {response.status}")
+
+                await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+
+    async def _dalle_generate_with_retry(self, max_attempts: int = 4, **kwargs):
+        """Call DALL-E images.generate, retrying rate limits and 5xx errors"""
+        async with self._dalle_semaphore:
+            for attempt in range(max_attempts):
+                try:
+                    return await self.openai_client.images.generate(**kwargs)
+                except (openai.RateLimitError, openai.InternalServerError) as e:
+                    if attempt + 1 >= max_attempts:
+                        raise
+                    retry_after = None
+                    response = getattr(e, "response", None)
+                    if response is not None:
+                        retry_after = response.headers.get("retry-after")
+                    await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+
+    # Styles whose limited palettes compress well as 256-color indexed PNGs
+    QUANTIZABLE_STYLES = frozenset({"pixel", "cartoon", "minimalist"})
+
+    @classmethod
+    def _cache_bytes(cls, image: Image.Image, image_bytes: Optional[bytes],
+                     style: str) -> Optional[bytes]:
+        """PNG bytes to store in caches: palettized for limited-palette styles
+
+        8bpp indexed PNG is roughly 4x smaller than RGB for pixel, cartoon and
+        minimalist output; realistic images keep their original encoding.
+        """
+        if style not in cls.QUANTIZABLE_STYLES:
+            return image_bytes
+
+        quantized = image.convert("RGB").quantize(
+            colors=256, dither=Image.Dither.FLOYDSTEINBERG
+        )
+        buffer = io.BytesIO()
+        quantized.save(buffer, format='PNG', optimize=True)
+        return buffer.getvalue()
+
+    def _cache_key(self, model: str, enhanced_prompt: str, request: AIGenerationRequest) -> str:
+        """Deterministic hash of the full generation request (no timestamp)
+
+        SHA-256 over MD5: OpenSSL uses the SHA-NI/ARMv8 crypto instructions
+        for it on modern CPUs, so it is both faster and better distributed.
+        """
+        key_text = f"{model}|{enhanced_prompt}|{request.style}|{request.dimensions}|{request.quality}"
+        return hashlib.sha256(key_text.encode()).hexdigest()
+
+    def _exact_cache_put(self, cache_key: str, image_bytes: bytes) -> None:
+        """Insert into the exact cache, evicting the least recently used"""
+        self._exact_cache[cache_key] = image_bytes
+        self._exact_cache.move_to_end(cache_key)
+        while len(self._exact_cache) > self._exact_cache_max:
+            self._exact_cache.popitem(last=False)
+
+    def _cached_result(self, cache_key: str, model: str, enhanced_prompt: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result for this exact request, or None on a miss"""
+        image_bytes = self._exact_cache.get(cache_key)
+        if image_bytes is None:
+            return None
+        self._exact_cache.move_to_end(cache_key)
+
+        image = Image.open(io.BytesIO(image_bytes))
+        if image.mode == "P":
+            # Palettized cache entry: hand clients a plain RGB image
+            image = image.convert("RGB")
+
+        return {
+            "success": True,
+            "asset_id": cache_key[:12],
+            "image": image,
+            "image_bytes": image_bytes,
+            "model_used": model,
+            "prompt_used": enhanced_prompt,
+            "generation_time": time.time(),
+            "cache_hit": True
+        }
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the shared aiohttp session with a pooled connector"""
+        if self._session is None or self._session.closed:
+            # Keep-alive pooling amortizes TCP+TLS setup across API calls
+            connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def warmup(self):
+        """Pre-warm DNS + TLS toward both providers so the first real request
+        sees steady-state latency instead of paying connection setup"""
+        session = await self._get_session()
+        for url in ("https://api.openai.com", "https://api.stability.ai"):
+            try:
+                async with session.head(url, timeout=aiohttp.ClientTimeout(total=5)):
+                    pass
+            except Exception:
+                # Warmup is best-effort; real calls surface their own errors
+                pass
+
+    async def close(self):
+        """Close the shared aiohttp session (call on application shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def generate_with_dalle(self, request: AIGenerationRequest) -> Dict[str, Any]:
         """Generate asset using OpenAI DALL-E"""
         if not self.openai_api_key:
             raise ValueError("OpenAI API key not configured")
         
-        # Enhance prompt with style
-        style_enhancement = self.dalle_style_prompts.get(request.style, "")
-        enhanced_prompt = f"{request.prompt}, {style_enhancement}, game asset"
-        
+        # Enhance prompt with style (suffix preserves the legacy unknown-style form)
+        enhanced_prompt = request.prompt + self.dalle_templates.get(request.style, ", , game asset")
+
+        # Precomputed kwargs double as validation of (dimensions, quality)
+        dalle_kwargs = self._dalle_kwargs.get((request.dimensions, request.quality))
+        if dalle_kwargs is None:
+            raise ValueError(
+                f"DALL-E 3 does not support dimensions={request.dimensions} "
+                f"quality={request.quality}; supported dimensions: "
+                f"{', '.join(DALLE_SUPPORTED_DIMENSIONS)}"
+            )
+
+        # Exact-match cache lookup before the paid API call
+        cache_key = self._cache_key("dalle", enhanced_prompt, request)
+        cached = self._cached_result(cache_key, "dall-e-3", enhanced_prompt)
+        if cached is not None:
+            return cached
+
         try:
-            # Parse dimensions
-            width, height = map(int, request.dimensions.split('x'))
-            size = f"{width}x{height}" if width == height else "1024x1024"
-            
             # Generate image using DALL-E 3
-            response = openai.Image.create(
-                model="dall-e-3",
+            response = await self._dalle_generate_with_retry(
                 prompt=enhanced_prompt,
-                size=size,
-                quality=request.quality,
-                n=1
+                **dalle_kwargs
             )
-            
-            # Download the generated image
+
+            # Download the generated image in chunks instead of buffering twice
             image_url = response.data[0].url
-            image_response = requests.get(image_url)
-            image = Image.open(io.BytesIO(image_response.content))
-            
-            # Generate unique ID
-            asset_id = hashlib.md5(f"dalle_{enhanced_prompt}_{time.time()}".encode()).hexdigest()[:12]
-            
+            session = await self._get_session()
+            buffer = io.BytesIO()
+            async with session.get(image_url) as image_response:
+                async for chunk in image_response.content.iter_chunked(64 * 1024):
+                    buffer.write(chunk)
+            image_bytes = buffer.getvalue()
+            buffer.seek(0)
+            # DALL-E serves PNG; naming the format skips plugin auto-detection
+            image = Image.open(buffer, formats=("PNG",))
+
+            # Deterministic ID; cache the downloaded PNG for repeat requests
+            asset_id = cache_key[:12]
+            self._exact_cache_put(cache_key, self._cache_bytes(image, image_bytes, request.style))
+
             return {
                 "success": True,
                 "asset_id": asset_id,
                 "image": image,
+                "image_bytes": image_bytes,
                 "model_used": "dall-e-3",
                 "prompt_used": enhanced_prompt,
                 "original_url": image_url,
-                "generation_time": time.time()
+                "generation_time": time.time(),
+                "cache_hit": False
             }
             
         except Exception as e:
@@ -103,19 +416,24 @@ class RealAIAssetGenerator:
                 "model_used": "dall-e-3"
             }
 
-    def generate_with_stable_diffusion(self, request: AIGenerationRequest) -> Dict[str, Any]:
+    async def generate_with_stable_diffusion(self, request: AIGenerationRequest) -> Dict[str, Any]:
         """Generate asset using Stability AI Stable Diffusion"""
         if not self.stability_api_key:
             raise ValueError("Stability AI API key not configured")
         
-        # Enhance prompt with style
-        style_enhancement = self.sd_style_prompts.get(request.style, "")
-        enhanced_prompt = f"{request.prompt}, {style_enhancement}, game asset, high quality"
-        
+        # Enhance prompt with style (suffix preserves the legacy unknown-style form)
+        enhanced_prompt = request.prompt + self.sd_templates.get(request.style, ", , game asset, high quality")
+
+        # Exact-match cache lookup before the paid API call
+        cache_key = self._cache_key("sd", enhanced_prompt, request)
+        cached = self._cached_result(cache_key, "stable-diffusion-xl", enhanced_prompt)
+        if cached is not None:
+            return cached
+
         try:
             # Parse dimensions
-            width, height = map(int, request.dimensions.split('x'))
-            
+            width, height = parse_dimensions(request.dimensions)
+
             # Prepare request data
             data = {
                 "text_prompts": [
@@ -131,35 +449,23 @@ class RealAIAssetGenerator:
                 "steps": 30,
             }
             
-            # Make API request
-            response = requests.post(
-                self.stability_url,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                    "Authorization": f"Bearer {self.stability_api_key}"
-                },
-                json=data
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Stability AI API error: {response.status_code}")
-            
-            # Process response
-            response_data = response.json()
-            image_data = base64.b64decode(response_data["artifacts"][0]["base64"])
+            # Make API request; ask for the raw PNG to skip JSON + base64 decode
+            image_data = await self._post_stability(data, "image/png")
             image = Image.open(io.BytesIO(image_data))
-            
-            # Generate unique ID
-            asset_id = hashlib.md5(f"sd_{enhanced_prompt}_{time.time()}".encode()).hexdigest()[:12]
-            
+
+            # Deterministic ID; cache the PNG bytes for repeat requests
+            asset_id = cache_key[:12]
+            self._exact_cache_put(cache_key, self._cache_bytes(image, image_data, request.style))
+
             return {
                 "success": True,
                 "asset_id": asset_id,
                 "image": image,
+                "image_bytes": image_data,
                 "model_used": "stable-diffusion-xl",
                 "prompt_used": enhanced_prompt,
-                "generation_time": time.time()
+                "generation_time": time.time(),
+                "cache_hit": False
             }
             
         except Exception as e:
@@ -169,28 +475,115 @@ class RealAIAssetGenerator:
                 "model_used": "stable-diffusion-xl"
             }
 
-    def generate_asset(self, request: AIGenerationRequest) -> Dict[str, Any]:
+    async def generate_with_stable_diffusion_batch(self, request: AIGenerationRequest,
+                                                   samples: int) -> list:
+        """Generate several variations of one prompt in a single Stability call
+
+        Uses the samples parameter so a batch of identical requests costs one
+        HTTP round-trip (and one TLS+auth) instead of N. Returns one result
+        dict per variation. DALL-E 3 is limited to n=1, so batching only
+        exists for the Stability path.
+        """
+        if not self.stability_api_key:
+            raise ValueError("Stability AI API key not configured")
+
+        enhanced_prompt = request.prompt + self.sd_templates.get(request.style, ", , game asset, high quality")
+        cache_key = self._cache_key("sd", enhanced_prompt, request)
+        start_time = time.time()
+
+        try:
+            width, height = parse_dimensions(request.dimensions)
+
+            data = {
+                "text_prompts": [
+                    {
+                        "text": enhanced_prompt,
+                        "weight": 1.0
+                    }
+                ],
+                "cfg_scale": 7,
+                "height": height,
+                "width": width,
+                "samples": samples,
+                "steps": 30,
+            }
+
+            # Multi-image responses only come back as JSON artifacts
+            body = await self._post_stability(data, "application/json")
+            response_data = orjson.loads(body)
+
+            results = []
+            for i, artifact in enumerate(response_data["artifacts"]):
+                image_data = base64.b64decode(artifact["base64"])
+                results.append({
+                    "success": True,
+                    "asset_id": hashlib.sha256(f"{cache_key}|{i}".encode()).hexdigest()[:12],
+                    "image": Image.open(io.BytesIO(image_data)),
+                    "image_bytes": image_data,
+                    "model_used": "stable-diffusion-xl",
+                    "prompt_used": enhanced_prompt,
+                    "generation_time": time.time(),
+                    "total_generation_time": time.time() - start_time,
+                    "cache_hit": False
+                })
+
+            # Seed the exact cache so later single requests for this prompt hit
+            if results and cache_key not in self._exact_cache:
+                self._exact_cache_put(
+                    cache_key,
+                    self._cache_bytes(results[0]["image"], results[0]["image_bytes"], request.style)
+                )
+
+            return results
+
+        except Exception as e:
+            return [{
+                "success": False,
+                "error": str(e),
+                "model_used": "stable-diffusion-xl"
+            }] * samples
+
+    async def generate_asset(self, request: AIGenerationRequest) -> Dict[str, Any]:
         """
         Main generation method that routes to appropriate AI model
         """
         start_time = time.time()
-        
+
         try:
+            # Approximate cache: semantically similar prompts skip the API call
+            if self.embedding_cache is not None:
+                cached = await asyncio.to_thread(self.embedding_cache.lookup, request)
+                if cached is not None:
+                    asset_id, image_bytes = cached
+                    image = Image.open(io.BytesIO(image_bytes))
+                    if image.mode == "P":
+                        image = image.convert("RGB")
+                    return {
+                        "success": True,
+                        "asset_id": asset_id,
+                        "image": image,
+                        "image_bytes": image_bytes,
+                        "model_used": "cache_hit",
+                        "prompt_used": request.prompt,
+                        "total_generation_time": time.time() - start_time
+                    }
+
             if request.model_preference == "dalle" and self.openai_api_key:
-                result = self.generate_with_dalle(request)
+                result = await self.generate_with_dalle(request)
             elif request.model_preference == "stable_diffusion" and self.stability_api_key:
-                result = self.generate_with_stable_diffusion(request)
+                result = await self.generate_with_stable_diffusion(request)
             else:
                 # Fallback to available model or procedural generation
                 if self.openai_api_key:
-                    result = self.generate_with_dalle(request)
+                    result = await self.generate_with_dalle(request)
                 elif self.stability_api_key:
-                    result = self.generate_with_stable_diffusion(request)
+                    result = await self.generate_with_stable_diffusion(request)
                 else:
                     # Fallback to procedural generation from original MVP
-                    from gamedev_ai_mvp import AIAssetGenerator
-                    fallback_generator = AIAssetGenerator()
-                    fallback_result = fallback_generator.generate_asset(
+                    if self._fallback is None:
+                        from gamedev_ai_mvp import AIAssetGenerator
+                        self._fallback = AIAssetGenerator()
+                    fallback_result = self._fallback.generate_asset(
                         request.prompt, "texture", request.style, request.dimensions
                     )
                     return {
@@ -200,12 +593,22 @@ class RealAIAssetGenerator:
                         "model_used": "procedural_fallback",
                         "prompt_used": request.prompt,
                         "generation_time": time.time() - start_time,
+                        "total_generation_time": time.time() - start_time,
                         "note": "Used procedural generation as AI APIs not configured"
                     }
             
             if result["success"]:
                 result["total_generation_time"] = time.time() - start_time
-            
+
+                if self.embedding_cache is not None:
+                    cache_bytes = self._cache_bytes(
+                        result["image"], result.get("image_bytes"), request.style
+                    )
+                    await asyncio.to_thread(
+                        self.embedding_cache.store, request, result["asset_id"],
+                        result["image"], cache_bytes
+                    )
+
             return result
             
         except Exception as e:
@@ -224,14 +627,14 @@ class RealAIAssetGenerator:
         }
 
 # Example usage and testing
-if __name__ == "__main__":
+async def _example_usage():
     # Initialize the real AI generator
     ai_generator = RealAIAssetGenerator()
-    
+
     # Check available models
     available_models = ai_generator.get_available_models()
     print("Available AI Models:", available_models)
-    
+
     # Example generation request
     request = AIGenerationRequest(
         prompt="fantasy sword with glowing blue runes",
@@ -239,19 +642,24 @@ if __name__ == "__main__":
         dimensions="512x512",
         model_preference="dalle"
     )
-    
+
     # Generate asset
-    result = ai_generator.generate_asset(request)
-    
+    result = await ai_generator.generate_asset(request)
+
     if result["success"]:
         print(f"✅ Asset generated successfully!")
         print(f"Model used: {result['model_used']}")
         print(f"Asset ID: {result['asset_id']}")
         print(f"Generation time: {result['total_generation_time']:.2f}s")
-        
+
         # Save the generated image
         if "image" in result:
             result["image"].save(f"generated_{result['asset_id']}.png")
             print(f"Image saved as: generated_{result['asset_id']}.png")
     else:
         print(f"❌ Generation failed: {result['error']}")
+
+    await ai_generator.close()
+
+if __name__ == "__main__":
+    asyncio.run(_example_usage())
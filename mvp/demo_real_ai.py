@@ -75,7 +75,7 @@ async def demo_real_ai_integration():
         )
         
         start_time = time.time()
-        result = ai_generator.generate_asset(request)
+        result = await ai_generator.generate_asset(request)
         
         if result["success"]:
             # Save the generated image
@@ -130,6 +130,8 @@ async def demo_real_ai_integration():
         for r in successful:
             print(f"   • {r['filename']} ({r['type']})")
     
+    await ai_generator.close()
+
     print("\n🎯 Integration Features Demonstrated:")
     print("   ✅ Multi-model support (DALL-E + Stable Diffusion)")
     print("   ✅ Automatic fallback to procedural generation")
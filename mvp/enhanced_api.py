@@ -5,20 +5,35 @@ Supports OpenAI DALL-E and Stable Diffusion APIs
 
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
+import asyncio
 import base64
 import io
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import time
 import os
-from ai_integration import RealAIAssetGenerator, AIGenerationRequest
+from ai_integration import (
+    RealAIAssetGenerator,
+    AIGenerationRequest,
+    DALLE_SUPPORTED_DIMENSIONS,
+)
+
+# Optional libvips-backed PNG encoder (SIMD filters, releases the GIL)
+try:
+    import pyvips
+except ImportError:
+    pyvips = None
 
 # Initialize FastAPI app
 app = FastAPI(
     title="GameDev AI Tools API",
     description="AI-powered game development tools with real AI model integration",
-    version="2.0.0"
+    version="2.0.0",
+    # orjson serializes the multi-MB base64 payloads far faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware for Unity integration
@@ -33,6 +48,11 @@ app.add_middleware(
 # Initialize AI generator
 ai_generator = RealAIAssetGenerator()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared HTTP session on shutdown"""
+    await ai_generator.close()
+
 # Pydantic models for API
 class EnhancedAssetRequest(BaseModel):
     prompt: str
@@ -65,12 +85,50 @@ class ModelCapabilities(BaseModel):
     max_prompt_length: int
     estimated_generation_time: str
 
-def image_to_base64(image: Image.Image) -> str:
-    """Convert PIL Image to base64 string"""
+def _encode_png(image: Image.Image) -> bytes:
+    """Encode a PIL image to PNG bytes (fast settings; meant for a worker thread)"""
+    if pyvips is not None:
+        # libvips encodes 3-5x faster than Pillow's single-threaded zlib path
+        vips_img = pyvips.Image.new_from_memory(
+            image.tobytes(), image.width, image.height, len(image.getbands()), 'uchar'
+        )
+        return vips_img.write_to_buffer('.png[compression=1]')
+
     buffer = io.BytesIO()
-    image.save(buffer, format='PNG')
-    img_str = base64.b64encode(buffer.getvalue()).decode()
-    return img_str
+    image.save(buffer, format='PNG', optimize=False, compress_level=1)
+    return buffer.getvalue()
+
+async def result_to_base64(result: Dict[str, Any]) -> str:
+    """Base64-encode a generation result, reusing raw PNG bytes when available"""
+    if "image_bytes" in result:
+        # Already-encoded PNG from the provider: skip the PIL re-encode
+        return base64.b64encode(result["image_bytes"]).decode()
+    # PNG encoding is 50-200ms of pure CPU; keep it off the event loop
+    png_bytes = await asyncio.to_thread(_encode_png, result["image"])
+    return base64.b64encode(png_bytes).decode()
+
+@app.on_event("startup")
+async def startup_event():
+    """Bound the default executor and pre-warm everything first-request latency depends on"""
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=os.cpu_count()))
+
+    # Warm DNS/TLS toward the AI providers and touch the model config
+    await ai_generator.warmup()
+    ai_generator.get_available_models()
+
+    # Pre-load Pillow's format plugins so the first Image.open skips discovery
+    Image.init()
+
+def _validate_dalle_dimensions(request: EnhancedAssetRequest):
+    """Reject dimensions DALL-E cannot produce instead of silently resizing"""
+    if (request.model_preference == "dalle"
+            and ai_generator.openai_api_key
+            and request.dimensions not in DALLE_SUPPORTED_DIMENSIONS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"DALL-E 3 supports dimensions: {', '.join(DALLE_SUPPORTED_DIMENSIONS)}"
+        )
 
 @app.get("/", response_model=Dict[str, str])
 async def root():
@@ -146,7 +204,9 @@ async def generate_enhanced_asset(request: EnhancedAssetRequest):
         
         if len(request.prompt) > 4000:
             raise HTTPException(status_code=400, detail="Prompt too long (max 4000 characters)")
-        
+
+        _validate_dalle_dimensions(request)
+
         # Create AI generation request
         ai_request = AIGenerationRequest(
             prompt=request.prompt,
@@ -157,18 +217,19 @@ async def generate_enhanced_asset(request: EnhancedAssetRequest):
         )
         
         # Generate asset using AI
-        result = ai_generator.generate_asset(ai_request)
+        result = await ai_generator.generate_asset(ai_request)
         
         if result["success"]:
             # Convert image to base64 for API response
-            image_base64 = image_to_base64(result["image"])
+            image_base64 = await result_to_base64(result)
             
             # Prepare metadata
             metadata = {
                 "dimensions": request.dimensions,
                 "style": request.style,
                 "quality": request.quality,
-                "model_preference": request.model_preference
+                "model_preference": request.model_preference,
+                "cache_hit": result.get("cache_hit", False)
             }
             
             # Add model-specific metadata if available
@@ -199,6 +260,48 @@ async def generate_enhanced_asset(request: EnhancedAssetRequest):
             error=f"Internal server error: {str(e)}"
         )
 
+@app.post("/api/v1/generate-asset/raw")
+async def generate_enhanced_asset_raw(request: EnhancedAssetRequest):
+    """
+    Generate game asset and return it as raw image/png
+    Skips base64+JSON wrapping (~33% smaller payload); metadata travels in headers
+    """
+    if not request.prompt.strip():
+        raise HTTPException(status_code=400, detail="Prompt cannot be empty")
+
+    if len(request.prompt) > 4000:
+        raise HTTPException(status_code=400, detail="Prompt too long (max 4000 characters)")
+
+    _validate_dalle_dimensions(request)
+
+    ai_request = AIGenerationRequest(
+        prompt=request.prompt,
+        style=request.style,
+        dimensions=request.dimensions,
+        model_preference=request.model_preference,
+        quality=request.quality
+    )
+
+    result = await ai_generator.generate_asset(ai_request)
+
+    if not result["success"]:
+        raise HTTPException(status_code=502, detail=result["error"])
+
+    if "image_bytes" in result:
+        png_bytes = result["image_bytes"]
+    else:
+        png_bytes = await asyncio.to_thread(_encode_png, result["image"])
+
+    return StreamingResponse(
+        io.BytesIO(png_bytes),
+        media_type="image/png",
+        headers={
+            "X-Asset-Id": result["asset_id"],
+            "X-Model-Used": result["model_used"],
+            "X-Generation-Time": str(result["total_generation_time"])
+        }
+    )
+
 @app.post("/api/v1/generate-batch")
 async def generate_batch_assets(requests: list[EnhancedAssetRequest]):
     """
@@ -207,51 +310,94 @@ async def generate_batch_assets(requests: list[EnhancedAssetRequest]):
     """
     if len(requests) > 5:  # Limit batch size
         raise HTTPException(status_code=400, detail="Batch size limited to 5 requests")
-    
-    results = []
-    
-    for i, request in enumerate(requests):
+
+    # Bound concurrency to respect provider rate limits
+    semaphore = asyncio.Semaphore(5)
+
+    responses: list = [None] * len(requests)
+
+    async def fill_response(i: int, result: Dict[str, Any]):
+        if result["success"]:
+            responses[i] = EnhancedAssetResponse(
+                success=True,
+                asset_id=result["asset_id"],
+                model_used=result["model_used"],
+                generation_time=result["total_generation_time"],
+                prompt_used=result["prompt_used"],
+                image_base64=await result_to_base64(result),
+                metadata={"batch_index": i}
+            )
+        else:
+            responses[i] = EnhancedAssetResponse(
+                success=False,
+                error=result["error"],
+                metadata={"batch_index": i}
+            )
+
+    async def generate_batch_item(i: int, request: EnhancedAssetRequest):
         try:
-            # Add batch identifier to prompt
-            batch_prompt = f"{request.prompt} (batch {i+1}/{len(requests)})"
-            
             ai_request = AIGenerationRequest(
-                prompt=batch_prompt,
+                prompt=request.prompt,
                 style=request.style,
                 dimensions=request.dimensions,
                 model_preference=request.model_preference,
                 quality=request.quality
             )
-            
-            result = ai_generator.generate_asset(ai_request)
-            
-            if result["success"]:
-                image_base64 = image_to_base64(result["image"])
-                
-                results.append(EnhancedAssetResponse(
-                    success=True,
-                    asset_id=result["asset_id"],
-                    model_used=result["model_used"],
-                    generation_time=result["total_generation_time"],
-                    prompt_used=result["prompt_used"],
-                    image_base64=image_base64,
-                    metadata={"batch_index": i}
-                ))
-            else:
-                results.append(EnhancedAssetResponse(
-                    success=False,
-                    error=result["error"],
-                    metadata={"batch_index": i}
-                ))
-                
+
+            async with semaphore:
+                result = await ai_generator.generate_asset(ai_request)
+
+            await fill_response(i, result)
+
         except Exception as e:
-            results.append(EnhancedAssetResponse(
+            responses[i] = EnhancedAssetResponse(
                 success=False,
                 error=f"Batch item {i+1} failed: {str(e)}",
                 metadata={"batch_index": i}
-            ))
-    
-    return {"batch_results": results, "total_processed": len(results)}
+            )
+
+    async def generate_batch_group(request: EnhancedAssetRequest, indices: list):
+        """One Stability call with samples=N covering identical batch items"""
+        ai_request = AIGenerationRequest(
+            prompt=request.prompt,
+            style=request.style,
+            dimensions=request.dimensions,
+            model_preference=request.model_preference,
+            quality=request.quality
+        )
+
+        async with semaphore:
+            results = await ai_generator.generate_with_stable_diffusion_batch(
+                ai_request, samples=len(indices)
+            )
+
+        # Pad in case the provider returns fewer artifacts than requested
+        while len(results) < len(indices):
+            results.append({"success": False, "error": "Missing artifact in batched response"})
+
+        for i, result in zip(indices, results):
+            await fill_response(i, result)
+
+    # Identical requests can share a single provider round-trip
+    groups: Dict[tuple, list] = {}
+    for i, request in enumerate(requests):
+        key = (request.prompt, request.style, request.dimensions,
+               request.model_preference, request.quality)
+        groups.setdefault(key, []).append(i)
+
+    tasks = []
+    for indices in groups.values():
+        request = requests[indices[0]]
+        if (len(indices) > 1 and request.model_preference == "stable_diffusion"
+                and ai_generator.stability_api_key):
+            tasks.append(generate_batch_group(request, indices))
+        else:
+            tasks.extend(generate_batch_item(i, requests[i]) for i in indices)
+
+    # Run everything concurrently; each task catches its own errors
+    await asyncio.gather(*tasks)
+
+    return {"batch_results": responses, "total_processed": len(responses)}
 
 @app.get("/api/v1/usage-stats")
 async def get_usage_stats():
@@ -278,9 +424,6 @@ async def get_usage_stats():
     }
 
 # Include original endpoints for backward compatibility
-from gamedev_ai_mvp import app as original_app
-
-# Mount original endpoints
 @app.get("/api/v1/assets")
 async def get_asset_history(limit: int = 10):
     """Get history of generated assets (backward compatibility)"""
@@ -310,4 +453,13 @@ if __name__ == "__main__":
     print("🔍 Health Check: http://localhost:8000/health")
     print("=" * 50)
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop + httptools: fastest event loop / HTTP parser combination for
+    # this I/O-bound proxy workload; workers>1 scales across cores
+    uvicorn.run(
+        "enhanced_api:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count()
+    )
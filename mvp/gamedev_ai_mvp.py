@@ -23,15 +23,60 @@ from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
+import os
+import queue
 import sqlite3
-import json
+import orjson
+from collections import OrderedDict
+from functools import lru_cache
 import hashlib
+import re
+import threading
 import time
 from datetime import datetime
 import base64
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
-import random
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None:
+    # Plain njit rather than parallel=True: requests run on FastAPI's worker
+    # threads, and the default parallel backend is not safe to enter from
+    # several threads at once
+    @numba.njit(cache=True)
+    def _fill_texture_tiles(buf, idx, palette):
+        """Write the 20px texture tile pattern into an RGBA row-slab buffer"""
+        height, width = buf.shape[0], buf.shape[1]
+        for y in range(height):
+            if y % 20 > 15:
+                continue
+            ty = y // 20
+            for x in range(width):
+                if x % 20 <= 15:
+                    color = palette[idx[ty, x // 20]]
+                    buf[y, x, 0] = color[0]
+                    buf[y, x, 1] = color[1]
+                    buf[y, x, 2] = color[2]
+                    buf[y, x, 3] = 255
+else:
+    _fill_texture_tiles = None
+
+@lru_cache(maxsize=128)
+def _styled_palette(colors, contrast):
+    """Apply a style's contrast to a color palette, memoized across requests
+
+    The keyword color tables and style presets are small fixed sets, so the
+    same (colors, contrast) pairs recur constantly.
+    """
+    return np.clip(
+        np.asarray(colors, dtype=np.float32) * contrast, 0, 255
+    ).astype(np.uint8)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -41,9 +86,28 @@ app = FastAPI(
 )
 
 # Database setup
+_db_connection = None
+_db_lock = threading.Lock()
+
+def _get_connection() -> sqlite3.Connection:
+    """Return the shared database connection, opening it on first use
+
+    A single long-lived connection keeps SQLite's page cache warm and avoids
+    the open/close cost on every request. WAL mode lets reads proceed during
+    writes and makes commits cheap; callers serialize writes via _db_lock.
+    """
+    global _db_connection
+    if _db_connection is None:
+        conn = sqlite3.connect('gamedev_ai.db', check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        _db_connection = conn
+    return _db_connection
+
 def init_database():
     """Initialize SQLite database for storing generated assets and user data"""
-    conn = sqlite3.connect('gamedev_ai.db')
+    conn = _get_connection()
     cursor = conn.cursor()
     
     # Create assets table
@@ -71,8 +135,85 @@ def init_database():
         )
     ''')
     
+    # Index-backed ORDER BY for the history endpoint: scales with LIMIT
+    # instead of sorting the whole table per call
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_assets_created_at
+        ON assets(created_at DESC)
+    ''')
+
     conn.commit()
-    conn.close()
+
+# History query kept as one constant so SQLite reuses its compiled statement
+_ASSET_HISTORY_SQL = '''
+    SELECT asset_id, prompt, asset_type, metadata, created_at
+    FROM assets
+    ORDER BY created_at DESC
+    LIMIT ?
+'''
+
+# Asset history responses are cached per limit for a short TTL and
+# invalidated whenever a new asset is stored
+_ASSET_HISTORY_TTL = 30.0
+_asset_history_cache = {}
+
+# Asset rows are queued by request threads and written by one background
+# thread, which also does the JSON encoding off the request path and folds
+# queued rows into a single executemany + commit
+_write_queue = queue.Queue()
+
+def _writer_loop():
+    while True:
+        batch = [_write_queue.get()]
+        try:
+            while True:
+                batch.append(_write_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        rows = [
+            (asset_id, prompt, asset_type, file_path,
+             orjson.dumps(metadata).decode())
+            for asset_id, prompt, asset_type, file_path, metadata in batch
+        ]
+        try:
+            with _db_lock:
+                conn = _get_connection()
+                conn.executemany('''
+                    INSERT INTO assets (asset_id, prompt, asset_type, file_path, metadata)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', rows)
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Asset writer error: {e}")
+        finally:
+            for _ in batch:
+                _write_queue.task_done()
+
+_writer_thread = threading.Thread(target=_writer_loop, daemon=True)
+_writer_thread.start()
+
+def _flush_writes(timeout: float = 1.0):
+    """Best-effort drain of pending asset writes, bounded by a deadline
+
+    Queue.join() waits for items enqueued after it starts too, so a
+    sustained stream of generate requests could stall readers forever;
+    the deadline caps how long a history read can be held up.
+    """
+    deadline = time.monotonic() + timeout
+    while _write_queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+def _read_history_rows(limit: int) -> list:
+    """Flush pending writes, then fetch the newest asset rows"""
+    _flush_writes()
+    with _db_lock:
+        cursor = _get_connection().execute(_ASSET_HISTORY_SQL, (limit,))
+        return cursor.fetchall()
+
+# Largest canvas the generator will accept (2048x2048); bigger requests are
+# rejected up front instead of burning O(w*h) memory and CPU
+MAX_PIXELS = 4_194_304
 
 # Pydantic models for API requests/responses
 class AssetGenerationRequest(BaseModel):
@@ -110,6 +251,32 @@ class AIAssetGenerator:
             "pixel": {"saturation": 1.3, "contrast": 1.0},
             "minimalist": {"saturation": 0.7, "contrast": 1.1}
         }
+        # Keyword tables compiled once into single-pass scanners so each
+        # prompt analysis is one linear scan instead of K substring searches
+        self._color_map = {
+            "red": (255, 0, 0), "blue": (0, 0, 255), "green": (0, 255, 0),
+            "yellow": (255, 255, 0), "purple": (128, 0, 128), "orange": (255, 165, 0),
+            "brown": (139, 69, 19), "black": (0, 0, 0), "white": (255, 255, 255),
+            "gray": (128, 128, 128), "pink": (255, 192, 203)
+        }
+        self._shape_keywords = ["circle", "square", "triangle", "rectangle", "star", "diamond", "hexagon"]
+        # Adjectival forms ("circular sword") normalize to their base shape
+        self._shape_variants = {
+            "circular": "circle", "rectangular": "rectangle",
+            "triangular": "triangle", "hexagonal": "hexagon"
+        }
+        self._keyword_re = re.compile(
+            "|".join(list(self._color_map) + list(self._shape_variants) + self._shape_keywords),
+            re.IGNORECASE
+        )
+        # LRU cache of full generation results: identical (prompt, type,
+        # style, dimensions) requests skip procedural drawing and the DB write
+        self._result_cache = OrderedDict()
+        self._result_cache_max = 1024
+        self._result_cache_lock = threading.Lock()
+        # One PCG64 generator for all sampling; batched draws beat per-call
+        # random.choice and can be seeded for reproducible output
+        self._rng = np.random.default_rng()
     
     def generate_asset(self, prompt: str, asset_type: str, style: str = "realistic", dimensions: str = "256x256") -> dict:
         """
@@ -118,20 +285,35 @@ class AIAssetGenerator:
         Note: This MVP uses procedural generation as a placeholder for actual AI models
         In production, this would integrate with models like DALL-E, Stable Diffusion, or custom-trained models
         """
-        start_time = time.time()
-        
+        t_ns = time.time_ns()
+
+        # Serve repeat requests from the LRU result cache
+        cache_key = (prompt, asset_type, style, dimensions)
+        with self._result_cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                return cached
+
         # Parse dimensions
         width, height = map(int, dimensions.split('x'))
         
-        # Generate unique asset ID
-        asset_id = hashlib.md5(f"{prompt}_{asset_type}_{style}_{time.time()}".encode()).hexdigest()[:12]
+        # Generate unique asset ID; feed the hash incrementally rather than
+        # formatting and encoding one large throwaway string
+        h = hashlib.blake2b(digest_size=6)
+        h.update(prompt.encode())
+        h.update(asset_type.encode())
+        h.update(style.encode())
+        h.update(t_ns.to_bytes(8, 'little'))
+        asset_id = h.hexdigest()
         
         # Create procedural asset (placeholder for AI generation)
         image = self._create_procedural_asset(prompt, asset_type, style, width, height)
         
-        # Save asset
+        # Save asset; zlib level 1 trades a little file size for a much
+        # cheaper encode, and optimize=False skips PIL's filter heuristics
         file_path = f"assets/{asset_id}.png"
-        image.save(file_path)
+        image.save(file_path, format='PNG', compress_level=1, optimize=False)
         
         # Store in database
         metadata = {
@@ -139,145 +321,210 @@ class AIAssetGenerator:
             "asset_type": asset_type,
             "style": style,
             "dimensions": dimensions,
-            "file_size": len(image.tobytes()),
+            "file_size": os.path.getsize(file_path),
             "color_palette": self._extract_color_palette(image)
         }
         
         self._store_asset(asset_id, prompt, asset_type, file_path, metadata)
         
-        generation_time = time.time() - start_time
-        
-        return {
+        generation_time = (time.time_ns() - t_ns) / 1e9
+
+        result = {
             "asset_id": asset_id,
             "file_path": file_path,
             "metadata": metadata,
             "generation_time": generation_time
         }
+
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = result
+            if len(self._result_cache) > self._result_cache_max:
+                self._result_cache.popitem(last=False)
+
+        return result
     
     def _create_procedural_asset(self, prompt: str, asset_type: str, style: str, width: int, height: int) -> Image.Image:
         """Create procedural asset based on prompt analysis"""
         
         # Create base image
         image = Image.new('RGBA', (width, height), (255, 255, 255, 0))
-        draw = ImageDraw.Draw(image)
-        
+
         # Analyze prompt for colors and shapes
-        colors = self._analyze_prompt_colors(prompt)
-        shapes = self._analyze_prompt_shapes(prompt)
-        
+        colors, shapes = self._analyze_prompt(prompt)
+
         # Apply style modifications
         style_config = self.style_presets.get(style, self.style_presets["realistic"])
-        
+
         if asset_type == "texture":
-            self._generate_texture(draw, width, height, colors, style_config)
+            self._generate_texture(image, width, height, colors, style_config)
         elif asset_type == "sprite":
-            self._generate_sprite(draw, width, height, colors, shapes, style_config)
+            self._generate_sprite(image, width, height, colors, shapes, style_config)
         elif asset_type == "icon":
-            self._generate_icon(draw, width, height, colors, style_config)
+            self._generate_icon(image, width, height, colors, style_config)
         elif asset_type == "background":
-            self._generate_background(draw, width, height, colors, style_config)
+            self._generate_background(image, width, height, colors, style_config)
         
         return image
     
-    def _analyze_prompt_colors(self, prompt: str) -> List[tuple]:
-        """Extract color information from text prompt"""
-        color_keywords = {
-            "red": (255, 0, 0), "blue": (0, 0, 255), "green": (0, 255, 0),
-            "yellow": (255, 255, 0), "purple": (128, 0, 128), "orange": (255, 165, 0),
-            "brown": (139, 69, 19), "black": (0, 0, 0), "white": (255, 255, 255),
-            "gray": (128, 128, 128), "pink": (255, 192, 203)
+    def _analyze_prompt(self, prompt: str) -> tuple:
+        """Extract color and shape information in one scan over the prompt"""
+        matched = {
+            self._shape_variants.get(m := token.lower(), m)
+            for token in self._keyword_re.findall(prompt)
         }
-        
-        found_colors = []
-        prompt_lower = prompt.lower()
-        
-        for color_name, rgb in color_keywords.items():
-            if color_name in prompt_lower:
-                found_colors.append(rgb)
-        
+
+        found_colors = [rgb for name, rgb in self._color_map.items() if name in matched]
         # Default colors if none found
         if not found_colors:
             found_colors = [(100, 150, 200), (200, 100, 150), (150, 200, 100)]
-        
-        return found_colors
-    
+
+        found_shapes = [shape for shape in self._shape_keywords if shape in matched]
+        return found_colors, found_shapes if found_shapes else ["rectangle"]
+
+    def _analyze_prompt_colors(self, prompt: str) -> List[tuple]:
+        """Extract color information from text prompt"""
+        return self._analyze_prompt(prompt)[0]
+
     def _analyze_prompt_shapes(self, prompt: str) -> List[str]:
         """Extract shape information from text prompt"""
-        shape_keywords = ["circle", "square", "triangle", "rectangle", "star", "diamond", "hexagon"]
-        found_shapes = [shape for shape in shape_keywords if shape in prompt.lower()]
-        return found_shapes if found_shapes else ["rectangle"]
+        return self._analyze_prompt(prompt)[1]
     
-    def _generate_texture(self, draw, width, height, colors, style_config):
+    # Row-slab height for texture/background fills. Working in slabs bounds
+    # peak memory on huge canvases (one slab buffer instead of a full-size
+    # RGBA array) and keeps the hot buffer cache-resident. Multiple of the
+    # 20px texture grid so slab edges stay tile-aligned.
+    SLAB_ROWS = 500
+
+    def _generate_texture(self, image, width, height, colors, style_config):
         """Generate texture pattern"""
-        for i in range(0, width, 20):
-            for j in range(0, height, 20):
-                color = random.choice(colors)
-                # Apply style modifications
-                modified_color = tuple(int(c * style_config["contrast"]) for c in color)
-                draw.rectangle([i, j, i+15, j+15], fill=modified_color)
+        # Styled palette is memoized: the same palette/contrast pairs recur
+        styled = _styled_palette(tuple(colors), style_config["contrast"])
+
+        tiles_x = (width + 19) // 20
+        xs_tile = np.arange(width) // 20
+        # Filled 16px block per tile (the old inclusive rectangle bounds) with a gap
+        inside_x = np.arange(width) % 20 <= 15
+
+        buf = np.zeros((min(self.SLAB_ROWS, height), width, 4), dtype=np.uint8)
+        for y0 in range(0, height, self.SLAB_ROWS):
+            rows = min(self.SLAB_ROWS, height - y0)
+            slab = buf[:rows]
+            slab[:] = 0
+
+            # One random color index per 20px tile instead of per-tile Python calls
+            idx = self._rng.integers(0, len(styled), size=((rows + 19) // 20, tiles_x))
+
+            if _fill_texture_tiles is not None:
+                # Parallel JIT kernel writes rows directly into the slab
+                _fill_texture_tiles(slab, idx, styled)
+            else:
+                ys = np.arange(rows)
+                inside = (ys % 20 <= 15)[:, None] & inside_x[None, :]
+                tile_colors = styled[idx[ys // 20][:, xs_tile]]
+                slab[..., :3][inside] = tile_colors[inside]
+                slab[..., 3][inside] = 255
+
+            image.paste(Image.fromarray(slab, 'RGBA'), (0, y0))
     
-    def _generate_sprite(self, draw, width, height, colors, shapes, style_config):
+    @staticmethod
+    def _draw_circle_np(buf, cx, cy, r, color):
+        """Fill a circle into an RGBA buffer with a vectorized distance mask"""
+        h, w = buf.shape[:2]
+        Y, X = np.ogrid[:h, :w]
+        mask = (X - cx) ** 2 + (Y - cy) ** 2 <= r * r
+        buf[mask] = (*color, 255)
+
+    @staticmethod
+    def _draw_rect_np(buf, x0, y0, x1, y1, color):
+        """Fill a rectangle (inclusive bounds) into an RGBA buffer by slicing"""
+        h, w = buf.shape[:2]
+        buf[max(y0, 0):min(y1 + 1, h), max(x0, 0):min(x1 + 1, w)] = (*color, 255)
+
+    def _generate_sprite(self, image, width, height, colors, shapes, style_config):
         """Generate sprite with basic shapes"""
         center_x, center_y = width // 2, height // 2
         size = min(width, height) // 3
-        
-        for shape in shapes[:3]:  # Limit to 3 shapes
-            color = random.choice(colors)
+
+        buf = np.zeros((height, width, 4), dtype=np.uint8)
+        drawn = shapes[:3]  # Limit to 3 shapes
+        color_idx = self._rng.integers(0, len(colors), size=len(drawn))
+        for shape, ci in zip(drawn, color_idx):
+            color = colors[ci]
             if shape == "circle":
-                draw.ellipse([center_x-size, center_y-size, center_x+size, center_y+size], fill=color)
+                self._draw_circle_np(buf, center_x, center_y, size, color)
             elif shape == "rectangle":
-                draw.rectangle([center_x-size, center_y-size, center_x+size, center_y+size], fill=color)
+                self._draw_rect_np(buf, center_x - size, center_y - size,
+                                   center_x + size, center_y + size, color)
             size -= 10  # Make nested shapes smaller
-    
-    def _generate_icon(self, draw, width, height, colors, style_config):
+
+        image.paste(Image.fromarray(buf, 'RGBA'), (0, 0))
+
+    def _generate_icon(self, image, width, height, colors, style_config):
         """Generate simple icon"""
         center_x, center_y = width // 2, height // 2
         size = min(width, height) // 3
-        
-        # Simple icon with circle and inner shape
-        draw.ellipse([center_x-size, center_y-size, center_x+size, center_y+size], 
-                    fill=colors[0], outline=colors[1] if len(colors) > 1 else colors[0])
-        
+
+        # Simple icon with circle and inner shape; the 1px outline is the
+        # ring between the outer radius and radius-1
+        buf = np.zeros((height, width, 4), dtype=np.uint8)
+        Y, X = np.ogrid[:height, :width]
+        dist2 = (X - center_x) ** 2 + (Y - center_y) ** 2
+        buf[dist2 <= size * size] = (*colors[0], 255)
+        outline = colors[1] if len(colors) > 1 else colors[0]
+        buf[(dist2 <= size * size) & (dist2 > (size - 1) * (size - 1))] = (*outline, 255)
+
         # Inner detail
         inner_size = size // 2
-        draw.rectangle([center_x-inner_size, center_y-inner_size, center_x+inner_size, center_y+inner_size], 
-                      fill=colors[1] if len(colors) > 1 else (255, 255, 255))
+        self._draw_rect_np(buf, center_x - inner_size, center_y - inner_size,
+                           center_x + inner_size, center_y + inner_size,
+                           colors[1] if len(colors) > 1 else (255, 255, 255))
+
+        image.paste(Image.fromarray(buf, 'RGBA'), (0, 0))
     
-    def _generate_background(self, draw, width, height, colors, style_config):
+    def _generate_background(self, image, width, height, colors, style_config):
         """Generate background with gradient effect"""
-        for y in range(height):
-            # Simple gradient
-            ratio = y / height
-            color1, color2 = colors[0], colors[1] if len(colors) > 1 else colors[0]
-            
-            r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-            g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-            b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-            
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
+        color1, color2 = colors[0], colors[1] if len(colors) > 1 else colors[0]
+
+        # Vectorized vertical gradient, pasted in row slabs to bound memory
+        c1 = np.asarray(color1, dtype=np.float32)
+        c2 = np.asarray(color2, dtype=np.float32)
+        for y0 in range(0, height, self.SLAB_ROWS):
+            rows_n = min(self.SLAB_ROWS, height - y0)
+            ratio = np.arange(y0, y0 + rows_n, dtype=np.float32)[:, None] / height
+            rows = (c1 * (1 - ratio) + c2 * ratio).astype(np.uint8)
+
+            slab = np.broadcast_to(rows[:, None, :], (rows_n, width, 3))
+            slab_image = Image.fromarray(np.ascontiguousarray(slab), 'RGB').convert('RGBA')
+            image.paste(slab_image, (0, y0))
     
     def _extract_color_palette(self, image: Image.Image) -> List[str]:
         """Extract dominant colors from generated image"""
-        # Simplified color extraction
-        colors = image.getcolors(maxcolors=256*256*256)
-        if colors:
-            # Get top 5 colors
-            top_colors = sorted(colors, key=lambda x: x[0], reverse=True)[:5]
-            return [f"#{r:02x}{g:02x}{b:02x}" for count, (r, g, b, a) in top_colors if a > 0]
-        return ["#000000"]
+        # Count colors in NumPy: pack RGB into uint32 and bucket with np.unique,
+        # avoiding getcolors' giant hash table and the Python-side sort
+        pixels = np.asarray(image)
+        if pixels.ndim != 3:
+            return ["#000000"]
+
+        # Ignore fully transparent pixels like the getcolors path did
+        mask = pixels[..., 3] > 0 if pixels.shape[-1] == 4 else np.ones(pixels.shape[:2], dtype=bool)
+
+        packed = ((pixels[..., 0].astype(np.uint32) << 16)
+                  | (pixels[..., 1].astype(np.uint32) << 8)
+                  | pixels[..., 2].astype(np.uint32))
+        values, counts = np.unique(packed[mask], return_counts=True)
+        if values.size == 0:
+            return ["#000000"]
+
+        # Top 5 by count: partial selection, then order just those by frequency
+        k = min(5, values.size)
+        top = np.argpartition(-counts, k - 1)[:k]
+        top = top[np.argsort(-counts[top])]
+        return [f"#{value:06x}" for value in values[top]]
     
     def _store_asset(self, asset_id: str, prompt: str, asset_type: str, file_path: str, metadata: dict):
-        """Store asset information in database"""
-        conn = sqlite3.connect('gamedev_ai.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO assets (asset_id, prompt, asset_type, file_path, metadata)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (asset_id, prompt, asset_type, file_path, json.dumps(metadata)))
-        
-        conn.commit()
-        conn.close()
+        """Queue asset information for the background database writer"""
+        _write_queue.put((asset_id, prompt, asset_type, file_path, metadata))
+        _asset_history_cache.clear()
 
 # AI Debugging Assistant
 class AIDebugAssistant:
@@ -319,23 +566,32 @@ class AIDebugAssistant:
                 ]
             }
         }
-    
+        # One compiled alternation finds the error type in a single scan
+        # instead of a lowered substring check per known error
+        self._err_re = re.compile(
+            "|".join(map(re.escape, self.common_errors)), re.IGNORECASE
+        )
+        self._err_lookup = {name.lower(): info for name, info in self.common_errors.items()}
+
     def analyze_error(self, error_message: str, code_context: str = None, engine_type: str = "unity") -> dict:
         """Analyze error and provide debugging suggestions"""
-        session_id = hashlib.md5(f"{error_message}_{time.time()}".encode()).hexdigest()[:12]
+        h = hashlib.blake2b(digest_size=6)
+        h.update(error_message.encode())
+        h.update(time.time_ns().to_bytes(8, 'little'))
+        session_id = h.hexdigest()
         
         # Find matching error pattern
         error_analysis = "Unknown error type"
         suggested_solutions = ["Check the error message for specific details", "Review recent code changes"]
         relevant_docs = []
         
-        for error_type, info in self.common_errors.items():
-            if error_type.lower() in error_message.lower():
-                error_analysis = info["description"]
-                suggested_solutions = info["solutions"]
-                relevant_docs = info["documentation"]
-                break
-        
+        match = self._err_re.search(error_message)
+        if match:
+            info = self._err_lookup[match.group(0).lower()]
+            error_analysis = info["description"]
+            suggested_solutions = info["solutions"]
+            relevant_docs = info["documentation"]
+
         # Store debug session
         self._store_debug_session(session_id, error_message, error_analysis, suggested_solutions)
         
@@ -370,16 +626,13 @@ class AIDebugAssistant:
     
     def _store_debug_session(self, session_id: str, error_message: str, error_analysis: str, solutions: List[str]):
         """Store debugging session in database"""
-        conn = sqlite3.connect('gamedev_ai.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO debug_sessions (session_id, error_type, error_message, suggested_solution)
-            VALUES (?, ?, ?, ?)
-        ''', (session_id, error_analysis, error_message, json.dumps(solutions)))
-        
-        conn.commit()
-        conn.close()
+        with _db_lock:
+            conn = _get_connection()
+            conn.execute('''
+                INSERT INTO debug_sessions (session_id, error_type, error_message, suggested_solution)
+                VALUES (?, ?, ?, ?)
+            ''', (session_id, error_analysis, error_message, orjson.dumps(solutions).decode()))
+            conn.commit()
 
 # Initialize components
 asset_generator = AIAssetGenerator()
@@ -390,6 +643,13 @@ debug_assistant = AIDebugAssistant()
 async def startup_event():
     """Initialize database on startup"""
     init_database()
+    if _fill_texture_tiles is not None:
+        # Trigger Numba compilation now so the first request doesn't pay for it
+        _fill_texture_tiles(
+            np.zeros((20, 20, 4), dtype=np.uint8),
+            np.zeros((1, 1), dtype=np.int64),
+            np.zeros((1, 3), dtype=np.uint8),
+        )
     print("GameDev AI Solutions MVP started successfully!")
 
 @app.get("/")
@@ -413,11 +673,21 @@ async def generate_asset(request: AssetGenerationRequest):
     try:
         if request.asset_type not in asset_generator.supported_types:
             raise HTTPException(
-                status_code=400, 
+                status_code=400,
                 detail=f"Unsupported asset type. Supported types: {asset_generator.supported_types}"
             )
-        
-        result = asset_generator.generate_asset(
+
+        width, height = map(int, request.dimensions.split('x'))
+        if width * height > MAX_PIXELS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Requested dimensions exceed the {MAX_PIXELS} pixel limit (2048x2048)"
+            )
+
+        # Drawing and encoding are CPU-bound; run them on a worker thread so
+        # the event loop keeps serving other requests meanwhile
+        result = await asyncio.to_thread(
+            asset_generator.generate_asset,
             prompt=request.prompt,
             asset_type=request.asset_type,
             style=request.style,
@@ -430,7 +700,9 @@ async def generate_asset(request: AssetGenerationRequest):
             metadata=result["metadata"],
             generation_time=result["generation_time"]
         )
-    
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Asset generation failed: {str(e)}")
 
@@ -455,31 +727,36 @@ async def debug_assistance(request: DebugRequest):
         raise HTTPException(status_code=500, detail=f"Debug analysis failed: {str(e)}")
 
 @app.get("/api/v1/assets")
-async def get_asset_history(limit: int = 10):
-    """Get history of generated assets"""
+async def get_asset_history(limit: int = 10, parse_metadata: bool = False):
+    """Get history of generated assets
+
+    Metadata is returned as the stored JSON string unless parse_metadata is
+    set, so the common listing case skips one json.loads per row.
+    """
     try:
-        conn = sqlite3.connect('gamedev_ai.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT asset_id, prompt, asset_type, metadata, created_at
-            FROM assets
-            ORDER BY created_at DESC
-            LIMIT ?
-        ''', (limit,))
-        
+        cache_key = (limit, parse_metadata)
+        cached = _asset_history_cache.get(cache_key)
+        if cached is not None and cached[0] > time.time():
+            return cached[1]
+
+        # Read-your-writes: let the background writer drain before selecting.
+        # The flush wait, lock acquisition and fetch all happen off the event
+        # loop so other endpoints keep serving meanwhile
+        rows = await asyncio.to_thread(_read_history_rows, limit)
+
         assets = []
-        for row in cursor.fetchall():
+        for row in rows:
             assets.append({
                 "asset_id": row[0],
                 "prompt": row[1],
                 "asset_type": row[2],
-                "metadata": json.loads(row[3]),
+                "metadata": orjson.loads(row[3]) if parse_metadata else row[3],
                 "created_at": row[4]
             })
-        
-        conn.close()
-        return {"assets": assets, "total": len(assets)}
+
+        payload = {"assets": assets, "total": len(assets)}
+        _asset_history_cache[cache_key] = (time.time() + _ASSET_HISTORY_TTL, payload)
+        return payload
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve assets: {str(e)}")